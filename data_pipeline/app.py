@@ -7,9 +7,11 @@ import pandas as pd
 from sqlalchemy import create_engine, text
 from datetime import datetime
 
-from config import BASE_URL, API_KEY, DB_CONNECTION_STRING
+from config import (BASE_URL, API_KEY, DB_CONNECTION_STRING, TRACT_INGESTION,
+                    SHARD_WORKERS, SHARD_RETRIES, SHARD_CHUNKSIZE)
 from utils.census_api import fetch_census_data
 from utils.data_processing import process_data
+from utils.sharded_load import run_sharded_load, failed_shards
 
 # Set up logging
 logging.basicConfig(
@@ -200,6 +202,67 @@ def fetch_and_store_race_pop(engine):
         logger.error(f"Error fetching race data: {str(e)}")
         raise
         
+def fetch_and_store_household_type_tracts(engine, states_df):
+    """Fetch tract-level household type data and store in database, one process per state"""
+    logger.info("Fetching tract-level household type data")
+    indicator_map = {
+        "B11001_001E": "total_households",
+        "B11001_003E": "married_couple",
+        "B11001_005E": "male_householder",
+        "B11001_006E": "female_householder",
+        "B11001_008E": "living_alone",
+        "B11001_009E": "not_living_alone"
+    }
+
+    # Workers append into this table concurrently, so it must exist up front
+    create_table_sql = """
+    CREATE TABLE IF NOT EXISTS household_type_tract (
+        state_code VARCHAR(10),
+        county_code VARCHAR(10),
+        tract_code VARCHAR(10),
+        total_households INT,
+        married_couple INT,
+        male_householder INT,
+        female_householder INT,
+        living_alone INT,
+        not_living_alone INT,
+        last_updated DATETIME,
+        PRIMARY KEY (state_code, county_code, tract_code)
+    );
+    """
+
+    try:
+        with engine.connect() as connection:
+            connection.execute(text(create_table_sql))
+            connection.commit()
+
+        # Close pooled connections so forked workers do not inherit their sockets
+        engine.dispose()
+
+        results = run_sharded_load(
+            DB_CONNECTION_STRING,
+            states_df['state_code'].tolist(),
+            BASE_URL,
+            list(indicator_map.keys()),
+            indicator_map,
+            API_KEY,
+            'household_type_tract',
+            max_workers=SHARD_WORKERS,
+            max_retries=SHARD_RETRIES,
+            chunksize=SHARD_CHUNKSIZE
+        )
+
+        failed = failed_shards(results)
+        if failed:
+            raise Exception(f"Tract load failed for states: {failed}")
+
+        total_rows = sum(result['rows'] for result in results)
+        logger.info(f"Stored household type data for {total_rows} tracts")
+        return results
+    except Exception as e:
+        logger.error(f"Error fetching tract-level household type data: {str(e)}")
+        raise
+
 def calculate_probabilities(engine):
     """Calculate household and family type probabilities and store in database"""
     logger.info("Calculating household and family type probabilities")
@@ -293,7 +356,7 @@ def run_pipeline():
         engine = setup_database()
         
         # Fetch and store state data
-        fetch_and_store_states(engine)
+        states_df = fetch_and_store_states(engine)
         
         # Fetch and store household type data
         fetch_and_store_household_type(engine)
@@ -301,6 +364,10 @@ def run_pipeline():
         # Fetch and store family type data
         fetch_and_store_family_type(engine)
 
+        # Fetch and store tract-level household type data across a process pool
+        if TRACT_INGESTION:
+            fetch_and_store_household_type_tracts(engine, states_df)
+
         # Fetch and store racial population data
         fetch_and_store_race_pop(engine)
         
@@ -17,6 +17,12 @@ DB_CONNECTION_STRING = os.getenv("DB_CONNECTION_STRING")
 # Data refresh settings
 REFRESH_INTERVAL_DAYS = 30  # How often to refresh the data
 
+# Sharded tract-level ingestion settings
+TRACT_INGESTION = os.getenv("TRACT_INGESTION", "false").lower() == "true"
+SHARD_WORKERS = int(os.getenv("SHARD_WORKERS", os.cpu_count() or 1))  # One process per core
+SHARD_RETRIES = int(os.getenv("SHARD_RETRIES", "2"))  # Extra attempts for failed shards
+SHARD_CHUNKSIZE = int(os.getenv("SHARD_CHUNKSIZE", "1000"))  # Rows per INSERT batch
+
 # Logging configuration
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
 LOG_FILE = os.getenv("LOG_FILE", "logs/census_pipeline.log")
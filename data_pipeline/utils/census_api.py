@@ -4,13 +4,14 @@ Census API interaction utilities
 import requests
 import logging
 import time
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 logger = logging.getLogger(__name__)
 
 def fetch_census_data(base_url: str, variables: List[str], 
                       geo_filter: str, api_key: str, 
-                      max_retries: int = 3) -> List[List[str]]:
+                      max_retries: int = 3,
+                      geo_in: Optional[str] = None) -> List[List[str]]:
     """
     Fetch data from Census API with retry mechanism
     
@@ -20,6 +21,7 @@ def fetch_census_data(base_url: str, variables: List[str],
         geo_filter: Geographic filter (e.g., "state:*")
         api_key: Census API key
         max_retries: Maximum number of retry attempts
+        geo_in: Optional parent geography (e.g., "state:06" for tracts)
         
     Returns:
         List of lists with the data from Census API
@@ -29,6 +31,8 @@ def fetch_census_data(base_url: str, variables: List[str],
         "for": geo_filter,
         "key": api_key
     }
+    if geo_in:
+        params["in"] = geo_in
     
     # Add retry logic
     for attempt in range(max_retries):
@@ -4,26 +4,32 @@ Data processing utilities for Census data
 import pandas as pd
 import numpy as np
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 logger = logging.getLogger(__name__)
 
-def process_data(data: List[List[str]], indicator_map: Dict[str, str]) -> pd.DataFrame:
+def process_data(data: List[List[str]], indicator_map: Dict[str, str],
+                 geo_columns: Optional[Dict[str, str]] = None) -> pd.DataFrame:
     """
     Process Census API data into a pandas DataFrame
     
     Args:
         data: Raw data from Census API
         indicator_map: Mapping of column indices to column names
+        geo_columns: Mapping of geography headers to column names
+            (defaults to state only)
         
     Returns:
         DataFrame with processed data
     """
+    if geo_columns is None:
+        geo_columns = {'state': 'state_code'}
     header = data[0]
+    geo_idx = [(header.index(geo), column_name) for geo, column_name in geo_columns.items()]
     processed_data = []
     
     for row in data[1:]:
-        record = {'state_code': row[header.index('state')]}
+        record = {column_name: row[idx] for idx, column_name in geo_idx}
         
         # Process each indicator
         for var_code, column_name in indicator_map.items():
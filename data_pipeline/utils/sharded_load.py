@@ -0,0 +1,251 @@
+"""
+Process-pool sharded ingestion for tract-level Census data
+"""
+import logging
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from typing import List, Dict, Any, Optional
+
+import pandas as pd
+from sqlalchemy import create_engine, make_url, text
+from sqlalchemy.exc import DataError, IntegrityError, OperationalError
+
+from utils.census_api import fetch_census_data
+from utils.data_processing import process_data
+
+logger = logging.getLogger(__name__)
+
+# Per-process engine, created once by _init_worker in each pool worker
+_worker_engine = None
+
+# In-shard retries when concurrent shards contend for the same table locks
+LOCK_RETRIES = 5
+# MySQL lock wait timeout and deadlock error codes
+MYSQL_LOCK_ERRORS = (1205, 1213)
+
+TRACT_GEO_COLUMNS = {
+    'state': 'state_code',
+    'county': 'county_code',
+    'tract': 'tract_code'
+}
+
+def _init_worker(db_connection_string: str) -> None:
+    """
+    Create the database engine for a pool worker process
+
+    Args:
+        db_connection_string: SQLAlchemy connection string
+    """
+    global _worker_engine
+    engine_options = {}
+    # READ COMMITTED stops each shard's DELETE from taking gap locks that
+    # block the other shards' INSERTs (SQLite has no such isolation level)
+    if make_url(db_connection_string).get_backend_name() != 'sqlite':
+        engine_options['isolation_level'] = 'READ COMMITTED'
+    # Each worker only ever holds one connection at a time
+    _worker_engine = create_engine(
+        db_connection_string,
+        pool_size=1,
+        max_overflow=0,
+        pool_pre_ping=True,
+        **engine_options
+    )
+
+def _is_lock_error(e: Exception) -> bool:
+    """Check whether a database error is a deadlock or lock wait timeout"""
+    if not isinstance(e, OperationalError):
+        return False
+    args = getattr(e.orig, 'args', ())
+    return (bool(args) and args[0] in MYSQL_LOCK_ERRORS) or 'database is locked' in str(e.orig)
+
+def parse_tract_rows(data: List[List[str]], indicator_map: Dict[str, str]) -> pd.DataFrame:
+    """
+    Parse tract-level Census API data into a pandas DataFrame
+
+    Args:
+        data: Raw data from Census API
+        indicator_map: Mapping of Census variable codes to column names
+
+    Returns:
+        DataFrame with one row per tract, missing estimates as NaN
+    """
+    tract_df = process_data(data, indicator_map, TRACT_GEO_COLUMNS)
+    tract_df['last_updated'] = datetime.now()
+    return tract_df
+
+def _shard_result(state_code: str) -> Dict[str, Any]:
+    """Create an empty result for one shard"""
+    return {
+        'state_code': state_code,
+        'rows': 0,
+        'fetch_seconds': 0.0,
+        'parse_seconds': 0.0,
+        'load_seconds': 0.0,
+        'status': 'success',
+        'retryable': False,
+        'error': None
+    }
+
+def _write_shard(table_name: str, state_code: str, tract_df: pd.DataFrame, chunksize: int) -> None:
+    """
+    Replace one state's rows in the target table, retrying on lock contention
+
+    The delete and insert run in a single transaction, so a failed shard can
+    be rerun without touching any other state.
+    """
+    for attempt in range(LOCK_RETRIES):
+        try:
+            with _worker_engine.begin() as connection:
+                connection.execute(
+                    text(f"DELETE FROM {table_name} WHERE state_code = :state_code"),
+                    {'state_code': state_code}
+                )
+                tract_df.to_sql(table_name, connection, if_exists='append', index=False,
+                                method='multi', chunksize=chunksize)
+            return
+        except OperationalError as e:
+            if not _is_lock_error(e) or attempt == LOCK_RETRIES - 1:
+                raise
+            # Jittered backoff so contending shards do not retry in lockstep
+            wait_time = random.uniform(0, 0.1 * 2 ** attempt)
+            logger.warning(f"Shard for state {state_code} hit a lock conflict, "
+                           f"retrying in {wait_time:.2f} seconds")
+            time.sleep(wait_time)
+
+def _load_shard(state_code: str, base_url: str, variables: List[str],
+                indicator_map: Dict[str, str], api_key: str,
+                table_name: str, chunksize: int) -> Dict[str, Any]:
+    """
+    Fetch, parse and load all tracts for one state inside a pool worker
+
+    Fetch failures and exhausted lock retries are marked retryable; malformed
+    data and rows the database rejects are not, since rerunning cannot fix them.
+
+    Returns:
+        Shard result with row count, per-stage timings and status
+    """
+    result = _shard_result(state_code)
+
+    try:
+        start = time.perf_counter()
+        data = fetch_census_data(base_url, variables, "tract:*", api_key,
+                                 geo_in=f"state:{state_code}")
+        result['fetch_seconds'] = time.perf_counter() - start
+    except Exception as e:
+        logger.error(f"Shard for state {state_code} failed to fetch: {str(e)}")
+        result.update(status='failed', retryable=True, error=str(e))
+        return result
+
+    try:
+        start = time.perf_counter()
+        tract_df = parse_tract_rows(data, indicator_map)
+        result['parse_seconds'] = time.perf_counter() - start
+    except Exception as e:
+        logger.error(f"Shard for state {state_code} has malformed data: {str(e)}")
+        result.update(status='failed', retryable=False, error=str(e))
+        return result
+
+    try:
+        start = time.perf_counter()
+        _write_shard(table_name, state_code, tract_df, chunksize)
+        result['load_seconds'] = time.perf_counter() - start
+        result['rows'] = len(tract_df)
+    except (DataError, IntegrityError) as e:
+        logger.error(f"Shard for state {state_code} was rejected by the database: {str(e)}")
+        result.update(status='failed', retryable=False, error=str(e))
+    except Exception as e:
+        logger.error(f"Shard for state {state_code} failed to load: {str(e)}")
+        result.update(status='failed', retryable=True, error=str(e))
+
+    return result
+
+def failed_shards(results: List[Dict[str, Any]]) -> List[str]:
+    """
+    Get the state codes of shards that did not load
+
+    Args:
+        results: Shard results returned by run_sharded_load
+
+    Returns:
+        List of state codes, suitable for passing back to run_sharded_load
+    """
+    return [result['state_code'] for result in results if result['status'] != 'success']
+
+def run_sharded_load(db_connection_string: str, state_codes: List[str],
+                     base_url: str, variables: List[str],
+                     indicator_map: Dict[str, str], api_key: str,
+                     table_name: str, max_workers: Optional[int] = None,
+                     max_retries: int = 0, chunksize: int = 1000,
+                     mp_context=None) -> List[Dict[str, Any]]:
+    """
+    Load tract-level data with one shard per state across a process pool
+
+    Args:
+        db_connection_string: SQLAlchemy connection string used by each worker
+        state_codes: States to load, one shard each
+        base_url: Census API base URL
+        variables: List of Census variable codes to fetch
+        indicator_map: Mapping of Census variable codes to column names
+        api_key: Census API key
+        table_name: Existing target table, keyed by state_code
+        max_workers: Number of worker processes (defaults to CPU count)
+        max_retries: Number of extra attempts for retryable failed shards
+        chunksize: Rows per INSERT batch
+        mp_context: Optional multiprocessing context for the pool
+
+    Returns:
+        One result per state from its latest attempt
+    """
+    results = {}
+    pending = list(state_codes)
+    wall_start = time.perf_counter()
+
+    for attempt in range(max_retries + 1):
+        if not pending:
+            break
+        if attempt > 0:
+            logger.info(f"Retrying {len(pending)} failed shards "
+                        f"(attempt {attempt + 1}/{max_retries + 1})")
+
+        # A fresh pool per round, so a crashed worker cannot poison the retries
+        workers = min(max_workers or os.cpu_count() or 1, len(pending))
+        with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context,
+                                 initializer=_init_worker,
+                                 initargs=(db_connection_string,)) as executor:
+            futures = {
+                executor.submit(_load_shard, state_code, base_url, variables,
+                                indicator_map, api_key, table_name, chunksize): state_code
+                for state_code in pending
+            }
+            for future in as_completed(futures):
+                state_code = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    # Worker process died before it could report back
+                    result = _shard_result(state_code)
+                    result.update(status='failed', retryable=True, error=str(e))
+                result['attempts'] = attempt + 1
+                results[state_code] = result
+                logger.info(
+                    f"Shard {state_code}: {result['status']}, {result['rows']} rows "
+                    f"(fetch {result['fetch_seconds']:.2f}s, parse {result['parse_seconds']:.2f}s, "
+                    f"load {result['load_seconds']:.2f}s)"
+                )
+
+        pending = [state_code for state_code in pending
+                   if results[state_code]['status'] != 'success' and results[state_code]['retryable']]
+
+    shard_results = [results[state_code] for state_code in state_codes]
+    failed = failed_shards(shard_results)
+    total_rows = sum(result['rows'] for result in shard_results)
+    logger.info(f"Sharded load into {table_name}: {total_rows} rows from "
+                f"{len(shard_results) - len(failed)}/{len(shard_results)} shards "
+                f"in {time.perf_counter() - wall_start:.2f}s")
+    if failed:
+        logger.error(f"Shards still failing: {failed}")
+
+    return shard_results
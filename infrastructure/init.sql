@@ -51,6 +51,21 @@ CREATE TABLE IF NOT EXISTS household_family_type_probabilities (
     FOREIGN KEY (state_code) REFERENCES states(state_code) ON DELETE CASCADE
 );
 
+-- Create household_type_tract table (loaded per state by the sharded tract ingestion)
+CREATE TABLE IF NOT EXISTS household_type_tract (
+    state_code VARCHAR(10) NOT NULL,
+    county_code VARCHAR(10) NOT NULL,
+    tract_code VARCHAR(10) NOT NULL,
+    total_households INT,
+    married_couple INT,
+    male_householder INT,
+    female_householder INT,
+    living_alone INT,
+    not_living_alone INT,
+    last_updated DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    PRIMARY KEY (state_code, county_code, tract_code)
+);
+
 -- Create indexes with error handling
 -- Note: MySQL 8.0+ supports DROP INDEX IF EXISTS, older versions need this approach
 
@@ -0,0 +1,8 @@
+"""
+Test fixtures for the Census data pipeline
+"""
+import os
+import sys
+
+# The pipeline modules import each other as top-level modules (e.g. utils.census_api)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data_pipeline'))
@@ -0,0 +1,222 @@
+"""
+Tests for process-pool sharded tract ingestion
+"""
+import multiprocessing
+import os
+import time
+
+import pytest
+import requests
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from utils import sharded_load
+from utils.sharded_load import failed_shards, parse_tract_rows, run_sharded_load
+
+INDICATOR_MAP = {
+    "B11001_001E": "total_households",
+    "B11001_003E": "married_couple"
+}
+VARIABLES = list(INDICATOR_MAP.keys())
+STATES = ['01', '02', '04', '05']
+TRACTS_PER_STATE = 25
+
+# Forked workers inherit the monkeypatched fetch_census_data
+FORK_CONTEXT = multiprocessing.get_context('fork')
+
+def tract_data(state_code, tracts=TRACTS_PER_STATE):
+    """Build a Census API style response for one state's tracts"""
+    data = [VARIABLES + ['state', 'county', 'tract']]
+    for i in range(tracts):
+        data.append([str(100 + i), str(50 + i), state_code, '001', f'{i:06d}'])
+    return data
+
+@pytest.fixture
+def db_url(tmp_path):
+    """SQLite database with an empty household_type_tract table"""
+    url = f"sqlite:///{tmp_path / 'census.db'}"
+    engine = create_engine(url)
+    with engine.begin() as connection:
+        connection.execute(text("""
+            CREATE TABLE household_type_tract (
+                state_code VARCHAR(10),
+                county_code VARCHAR(10),
+                tract_code VARCHAR(10),
+                total_households INT,
+                married_couple INT,
+                last_updated DATETIME,
+                PRIMARY KEY (state_code, county_code, tract_code)
+            )
+        """))
+    engine.dispose()
+    return url
+
+def row_counts(db_url):
+    """Count loaded rows per state"""
+    engine = create_engine(db_url)
+    with engine.connect() as connection:
+        rows = connection.execute(text(
+            "SELECT state_code, COUNT(*) FROM household_type_tract GROUP BY state_code"
+        )).fetchall()
+    engine.dispose()
+    return dict(rows)
+
+def load(db_url, states=STATES, **kwargs):
+    """Run a sharded load with test defaults"""
+    options = {'max_workers': 4, 'chunksize': 100, 'mp_context': FORK_CONTEXT}
+    options.update(kwargs)
+    return run_sharded_load(db_url, states, 'http://census.test', VARIABLES,
+                            INDICATOR_MAP, 'key', 'household_type_tract', **options)
+
+def test_parse_tract_rows_maps_missing_estimates_to_nan():
+    data = [VARIABLES + ['state', 'county', 'tract'],
+            ['120', None, '06', '001', '000100'],
+            ['', '40', '06', '001', '000200']]
+
+    tract_df = parse_tract_rows(data, INDICATOR_MAP)
+
+    assert list(tract_df['tract_code']) == ['000100', '000200']
+    assert tract_df['state_code'].eq('06').all()
+    assert tract_df['county_code'].eq('001').all()
+    assert tract_df['married_couple'].isna().tolist() == [True, False]
+    assert tract_df['total_households'].isna().tolist() == [False, True]
+    assert tract_df['last_updated'].notna().all()
+
+def test_parse_tract_rows_requires_tract_geography():
+    data = [VARIABLES + ['state'], ['120', '60', '06']]
+
+    with pytest.raises(ValueError):
+        parse_tract_rows(data, INDICATOR_MAP)
+
+def test_is_lock_error():
+    def operational_error(*args):
+        return OperationalError("DELETE FROM household_type_tract", {}, Exception(*args))
+
+    assert sharded_load._is_lock_error(operational_error(1213, "Deadlock found"))
+    assert sharded_load._is_lock_error(operational_error(1205, "Lock wait timeout exceeded"))
+    assert sharded_load._is_lock_error(operational_error("database is locked"))
+    assert not sharded_load._is_lock_error(operational_error(2013, "Lost connection"))
+    assert not sharded_load._is_lock_error(ValueError("bad value"))
+
+def test_failed_shards():
+    results = [
+        {'state_code': '01', 'status': 'success'},
+        {'state_code': '02', 'status': 'failed'},
+        {'state_code': '04', 'status': 'failed'}
+    ]
+
+    assert failed_shards(results) == ['02', '04']
+
+def test_run_sharded_load_loads_every_state(monkeypatch, db_url):
+    monkeypatch.setattr(sharded_load, 'fetch_census_data',
+                        lambda base_url, variables, geo_filter, api_key, geo_in: tract_data(geo_in[-2:]))
+
+    results = load(db_url)
+
+    assert [result['state_code'] for result in results] == STATES
+    assert all(result['status'] == 'success' for result in results)
+    assert all(result['rows'] == TRACTS_PER_STATE for result in results)
+    assert all(result['attempts'] == 1 for result in results)
+    assert row_counts(db_url) == {state_code: TRACTS_PER_STATE for state_code in STATES}
+
+def test_run_sharded_load_replaces_existing_state_rows(monkeypatch, db_url):
+    monkeypatch.setattr(sharded_load, 'fetch_census_data',
+                        lambda base_url, variables, geo_filter, api_key, geo_in: tract_data(geo_in[-2:]))
+    load(db_url)
+
+    monkeypatch.setattr(sharded_load, 'fetch_census_data',
+                        lambda base_url, variables, geo_filter, api_key, geo_in: tract_data(geo_in[-2:], tracts=5))
+    load(db_url, states=['02'])
+
+    assert row_counts(db_url) == {'01': TRACTS_PER_STATE, '02': 5,
+                                  '04': TRACTS_PER_STATE, '05': TRACTS_PER_STATE}
+
+def test_run_sharded_load_retries_transient_failures(monkeypatch, db_url, tmp_path):
+    marker = tmp_path / 'failed_once'
+
+    def flaky_fetch(base_url, variables, geo_filter, api_key, geo_in):
+        if geo_in == 'state:02' and not marker.exists():
+            marker.touch()
+            raise requests.exceptions.ConnectionError("connection reset")
+        return tract_data(geo_in[-2:])
+
+    monkeypatch.setattr(sharded_load, 'fetch_census_data', flaky_fetch)
+
+    results = load(db_url, max_retries=2)
+
+    retried = results[STATES.index('02')]
+    assert retried['status'] == 'success'
+    assert retried['error'] is None
+    assert retried['attempts'] == 2
+    assert all(result['attempts'] == 1 for result in results if result['state_code'] != '02')
+    assert row_counts(db_url)['02'] == TRACTS_PER_STATE
+
+def test_run_sharded_load_does_not_retry_malformed_data(monkeypatch, db_url):
+    def fetch(base_url, variables, geo_filter, api_key, geo_in):
+        if geo_in == 'state:02':
+            return [VARIABLES + ['state'], ['120', '60', '02']]
+        return tract_data(geo_in[-2:])
+
+    monkeypatch.setattr(sharded_load, 'fetch_census_data', fetch)
+
+    results = load(db_url, max_retries=2)
+
+    malformed = results[STATES.index('02')]
+    assert malformed['status'] == 'failed'
+    assert malformed['retryable'] is False
+    assert malformed['attempts'] == 1
+    assert failed_shards(results) == ['02']
+
+def test_run_sharded_load_reports_dead_worker(monkeypatch, db_url):
+    def fetch(base_url, variables, geo_filter, api_key, geo_in):
+        if geo_in == 'state:02':
+            os._exit(1)
+        return tract_data(geo_in[-2:])
+
+    monkeypatch.setattr(sharded_load, 'fetch_census_data', fetch)
+
+    results = load(db_url, states=['02'], max_retries=1)
+
+    assert results[0]['status'] == 'failed'
+    assert results[0]['retryable'] is True
+    assert results[0]['attempts'] == 2
+    assert results[0]['error']
+
+def test_run_sharded_load_retries_after_dead_worker(monkeypatch, db_url, tmp_path):
+    marker = tmp_path / 'died_once'
+
+    def fetch(base_url, variables, geo_filter, api_key, geo_in):
+        if geo_in == 'state:02' and not marker.exists():
+            marker.touch()
+            os._exit(1)
+        return tract_data(geo_in[-2:])
+
+    monkeypatch.setattr(sharded_load, 'fetch_census_data', fetch)
+
+    results = load(db_url, max_retries=1)
+
+    assert failed_shards(results) == []
+    assert results[STATES.index('02')]['attempts'] == 2
+    assert row_counts(db_url) == {state_code: TRACTS_PER_STATE for state_code in STATES}
+
+@pytest.mark.skipif((os.cpu_count() or 1) < 4, reason="needs at least 4 cores")
+def test_run_sharded_load_scales_with_workers(monkeypatch, db_url):
+    def cpu_bound_fetch(base_url, variables, geo_filter, api_key, geo_in):
+        # Stand in for CPU-heavy parsing, which the GIL would otherwise serialize
+        deadline = time.process_time() + 0.5
+        while time.process_time() < deadline:
+            pass
+        return tract_data(geo_in[-2:])
+
+    monkeypatch.setattr(sharded_load, 'fetch_census_data', cpu_bound_fetch)
+
+    start = time.perf_counter()
+    load(db_url, max_workers=1)
+    serial_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    load(db_url, max_workers=4)
+    parallel_seconds = time.perf_counter() - start
+
+    # Four shards on four workers should take well under half the serial time
+    assert parallel_seconds < serial_seconds * 0.5